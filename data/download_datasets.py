@@ -1,11 +1,39 @@
 import os
+import sys
+import shutil
+import subprocess
+import threading
+import asyncio
 import requests
 import tarfile
 import zipfile
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from tqdm import tqdm
 
+# 可选的异步下载后端 (aiohttp + aiofiles, 系统调用更少, 并发下载吞吐更高)
+try:
+    import aiohttp
+    import aiofiles
+    has_aiohttp = True
+except ImportError:
+    has_aiohttp = False
+
+# Linux上换用uvloop事件循环 (libuv, 内核>=5.11时可走io_uring路径)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+# 可选的非加密哈希 (xxh3单核可达数GB/s; 校验只为防意外损坏, 无需加密强度)
+try:
+    import xxhash
+    has_xxhash = True
+except ImportError:
+    has_xxhash = False
+
 DATASETS_CONFIG = {
     'coco_captions': {
         'urls': [
@@ -13,11 +41,13 @@ DATASETS_CONFIG = {
             'http://images.cocodataset.org/zips/train2017.zip',
             'http://images.cocodataset.org/zips/val2017.zip'
         ],
-        'md5': ['...', '...', '...']
+        'md5': ['...', '...', '...'],
+        'xxh3': ['...', '...', '...']
     },
     'llava_instruct': {
         'url': 'https://huggingface.co/datasets/liuhaotian/LLaVA-Instruct-150K/resolve/main/llava_instruct_150k.json',
-        'md5': '...'
+        'md5': '...',
+        'xxh3': '...'
     },
     'vqa_v2': {
         'urls': [
@@ -26,27 +56,214 @@ DATASETS_CONFIG = {
             'https://s3.amazonaws.com/cvmlp/vqa/mscoco/vqa/v2_Questions_Val_mscoco.zip',
             'https://s3.amazonaws.com/cvmlp/vqa/mscoco/vqa/v2_Annotations_Val_mscoco.zip'
         ],
-        'md5': ['...', '...', '...', '...']
+        'md5': ['...', '...', '...', '...'],
+        'xxh3': ['...', '...', '...', '...']
     }
 }
 
-def download_file(url, dest):
+
+def new_hasher(algo='md5'):
+    if algo == 'xxh3':
+        return xxhash.xxh3_128()
+    return hashlib.md5()
+
+
+def pick_digest(config, i=None):
+    # 已安装xxhash且配置含xxh3摘要时优先用xxh3, 否则退回上游发布的MD5
+    if has_xxhash and 'xxh3' in config:
+        algo, digests = 'xxh3', config['xxh3']
+    else:
+        algo, digests = 'md5', config['md5']
+    return algo, (digests if i is None else digests[i])
+
+
+# 文件完整性校验
+def verify_digest(file_path, expected, algo='md5'):
+    with open(file_path, 'rb') as f:
+        if algo == 'md5' and sys.version_info >= (3, 11):
+            # C实现的读取循环, 大文件校验变为I/O瓶颈而非Python循环瓶颈
+            h = hashlib.file_digest(f, 'md5')
+        else:
+            h = new_hasher(algo)
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+    return h.hexdigest() == expected
+
+
+# 流式传输缓冲区大小 (1 MiB, 大块读写减少系统调用和Python层开销)
+CHUNK_SIZE = 1 << 20
+
+# 大于该阈值且服务器支持Range时走多段并行下载 (64 MiB)
+RANGED_MIN_SIZE = 64 << 20
+
+
+def make_session():
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=8)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _download_file_ranged(url, dest, total_size, num_parts=8, session=None):
+    # aria2风格: N个Range GET并行拉取, 各worker经os.pwrite写入自己的字节区间
+    session = session or requests
+    part = -(-total_size // num_parts)
+    fd = os.open(str(dest), os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+    try:
+        with tqdm(
+            desc=f"Downloading {Path(dest).name}",
+            total=total_size,
+            unit='B',
+            unit_scale=True
+        ) as bar:
+            def fetch_range(lo):
+                hi = min(lo + part, total_size) - 1
+                offset = lo
+                with session.get(url, headers={'Range': f'bytes={lo}-{hi}'},
+                                 stream=True) as r:
+                    r.raise_for_status()
+                    # 服务器不支持Range时返回200整文件, 此处必须是206分段响应
+                    if r.status_code != 206:
+                        raise RuntimeError(f'{url} ignored Range request')
+                    for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                        os.pwrite(fd, chunk, offset)
+                        offset += len(chunk)
+                        bar.update(len(chunk))
+
+            with ThreadPoolExecutor(max_workers=num_parts) as ex:
+                list(ex.map(fetch_range, range(0, total_size, part)))
+    finally:
+        os.close(fd)
+
+
+def download_file(url, dest, expected_digest=None, algo='md5', session=None, num_parts=8):
     Path(dest).parent.mkdir(parents=True, exist_ok=True)
-    with requests.get(url, stream=True) as r:
+    session = session or requests
+
+    # 大文件且CDN支持Range时多段并行下载, 下载后再整体校验摘要
+    try:
+        head = session.head(url, allow_redirects=True)
+        total_size = int(head.headers.get('content-length', 0))
+        accept_ranges = head.headers.get('accept-ranges', '').lower() == 'bytes'
+    except requests.RequestException:
+        total_size, accept_ranges = 0, False
+    if accept_ranges and total_size >= RANGED_MIN_SIZE and num_parts > 1:
+        try:
+            _download_file_ranged(url, dest, total_size,
+                                  num_parts=num_parts, session=session)
+        except (requests.RequestException, RuntimeError):
+            # 分段下载失败则回退单流重下
+            pass
+        else:
+            if expected_digest and expected_digest != '...':
+                if not verify_digest(dest, expected_digest, algo):
+                    Path(dest).unlink()
+                    raise RuntimeError(f'{Path(dest).name} {algo} mismatch after download')
+            return None
+
+    # 单流下载, 边下载边计算摘要, 避免下载完成后再整体重读一遍文件 ('...'占位符跳过校验)
+    hasher = new_hasher(algo) if expected_digest and expected_digest != '...' else None
+    with session.get(url, stream=True) as r:
         r.raise_for_status()
         total_size = int(r.headers.get('content-length', 0))
-        with open(dest, 'wb') as f, tqdm(
+        with open(dest, 'wb', buffering=CHUNK_SIZE) as f, tqdm(
             desc=f"Downloading {Path(dest).name}",
             total=total_size,
             unit='B',
             unit_scale=True
         ) as bar:
-            for chunk in r.iter_content(chunk_size=8192):
+            for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
                 f.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
                 bar.update(len(chunk))
+    if hasher is not None:
+        digest = hasher.hexdigest()
+        if digest != expected_digest:
+            Path(dest).unlink()
+            raise RuntimeError(f'{Path(dest).name} {algo} mismatch after download')
+        return digest
+    return None
+
+async def _download_file_async(session, url, dest, expected_digest=None, algo='md5'):
+    Path(dest).parent.mkdir(parents=True, exist_ok=True)
+    hasher = new_hasher(algo) if expected_digest and expected_digest != '...' else None
+    async with session.get(url) as r:
+        r.raise_for_status()
+        total_size = int(r.headers.get('content-length', 0))
+        async with aiofiles.open(dest, 'wb') as f:
+            with tqdm(
+                desc=f"Downloading {Path(dest).name}",
+                total=total_size,
+                unit='B',
+                unit_scale=True
+            ) as bar:
+                async for chunk in r.content.iter_chunked(CHUNK_SIZE):
+                    await f.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    bar.update(len(chunk))
+    if hasher is not None and hasher.hexdigest() != expected_digest:
+        Path(dest).unlink()
+        raise RuntimeError(f'{Path(dest).name} {algo} mismatch after download')
+
+
+async def _download_all_async(tasks):
+    async with aiohttp.ClientSession() as session:
+        return await asyncio.gather(
+            *[_download_file_async(session, url, dest, digest, algo)
+              for url, dest, digest, algo in tasks],
+            return_exceptions=True,
+        )
+
+
+def download_many(tasks, session=None):
+    # tasks为(url, dest, expected_digest, algo)列表; 优先走aiohttp异步后端, 否则回退线程池
+    # 返回与tasks对齐的结果列表 (成功为None, 失败为异常对象), 单个失败不中断其它任务
+    if has_aiohttp:
+        return asyncio.run(_download_all_async(tasks))
+
+    def run(t):
+        try:
+            download_file(t[0], t[1], expected_digest=t[2], algo=t[3], session=session)
+        except Exception as e:
+            return e
+        return None
+
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        return list(ex.map(run, tasks))
+
+
+def extract_zip(dest, dataset_dir):
+    # 优先使用系统unzip (C实现, 比zipfile.extractall快数倍)
+    if shutil.which('unzip'):
+        subprocess.run(['unzip', '-q', '-o', str(dest), '-d', str(dataset_dir)], check=True)
+        return
+
+    # 回退: 多线程解压, 每个线程持有独立的ZipFile句柄以绕开内部锁
+    with zipfile.ZipFile(dest) as zf:
+        names = zf.namelist()
+
+    # 预先建好全部目标目录: zipfile内部的makedirs不带exist_ok, 并发worker会竞争出错
+    for parent in {(Path(dataset_dir) / name).parent for name in names}:
+        parent.mkdir(parents=True, exist_ok=True)
+
+    local = threading.local()
+
+    def extract(name):
+        zf = getattr(local, 'zf', None)
+        if zf is None:
+            zf = local.zf = zipfile.ZipFile(dest)
+        zf.extract(name, dataset_dir)
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        list(ex.map(extract, names))
+
 
 if __name__ == '__main__':
     # 示例下载流程
+    session = make_session()
     for dataset in ['coco_captions', 'llava_instruct', 'vqa_v2']:
         print(f'Processing {dataset}')
         config = DATASETS_CONFIG[dataset]
@@ -55,47 +272,52 @@ if __name__ == '__main__':
         dataset_dir = Path(f'data/{dataset}')
         dataset_dir.mkdir(parents=True, exist_ok=True)
 
-        # MD5校验函数
-        def verify_md5(file_path, expected_md5):
-            hash_md5 = hashlib.md5()
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b''):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest() == expected_md5
-
-        # 下载逻辑
+        # 下载逻辑 (I/O密集型, 多URL并发下载)
         if 'urls' in config:
+            tasks = []
             for i, url in enumerate(config['urls']):
                 filename = url.split('/')[-1]
                 dest = dataset_dir / filename
-                
+                algo, expected = pick_digest(config, i)
+
                 # 断点续传检查
                 if dest.exists():
-                    if verify_md5(dest, config['md5'][i]):
-                        print(f'{filename} exists and MD5 verified')
+                    if verify_digest(dest, expected, algo):
+                        print(f'{filename} exists and {algo} verified')
                         continue
                     else:
-                        print(f'{filename} MD5 mismatch, redownloading')
+                        print(f'{filename} {algo} mismatch, redownloading')
                         dest.unlink()
-                
-                download_file(url, dest)
-                
-                # 解压ZIP文件
-                if filename.endswith('.zip'):
-                    with zipfile.ZipFile(dest, 'r') as zip_ref:
-                        zip_ref.extractall(dataset_dir)
-        
+
+                tasks.append((url, dest, expected, algo))
+
+            errors = download_many(tasks, session=session)
+
+            # 解压ZIP文件 (仅限本次下载成功的归档, 逐个解压避免磁盘争用;
+            # 个别任务失败不影响同批已完成归档的解压, 解压完再报失败)
+            first_error = None
+            for (_, dest, _, _), error in zip(tasks, errors):
+                if error is not None:
+                    print(f'{dest.name} download failed: {error}')
+                    first_error = first_error or error
+                elif dest.name.endswith('.zip'):
+                    extract_zip(dest, dataset_dir)
+            if first_error is not None:
+                raise first_error
+
         # 单文件下载
         elif 'url' in config:
             filename = config['url'].split('/')[-1]
             dest = dataset_dir / filename
-            
+
+            algo, expected = pick_digest(config)
             if dest.exists():
-                if verify_md5(dest, config['md5']):
-                    print(f'{filename} exists and MD5 verified')
+                if verify_digest(dest, expected, algo):
+                    print(f'{filename} exists and {algo} verified')
                     continue
                 else:
-                    print(f'{filename} MD5 mismatch, redownloading')
+                    print(f'{filename} {algo} mismatch, redownloading')
                     dest.unlink()
-            
-            download_file(config['url'], dest)
\ No newline at end of file
+
+            download_file(config['url'], dest, expected_digest=expected, algo=algo,
+                          session=session)
\ No newline at end of file
@@ -10,6 +10,12 @@ Modified from ConvNeXt official repo: https://github.com/facebookresearch/ConvNe
 # LICENSE file in the root directory of this source tree.
 
 
+import hashlib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
@@ -18,6 +24,102 @@ from timm.models.registry import register_model
 from timm.data import IMAGENET_DEFAULT_MEAN, IMAGENET_DEFAULT_STD
 from functools import partial
 
+# 可选: Triton运行时, 用于eval期按核尺寸特化深度卷积kernel
+try:
+    import triton
+    import triton.language as tl
+    has_triton = True
+except ImportError:
+    has_triton = False
+
+
+if has_triton:
+    @triton.jit
+    def _dwconv2d_kernel(x_ptr, w_ptr, b_ptr, y_ptr,
+                         C, H, W, OH, OW,
+                         KH: tl.constexpr, KW: tl.constexpr,
+                         PH: tl.constexpr, PW: tl.constexpr,
+                         NHWC: tl.constexpr,
+                         HAS_BIAS: tl.constexpr, BLOCK: tl.constexpr):
+        # 每个program处理单个(n,c)平面上BLOCK个输出像素; KH/KW为constexpr, 循环完全展开;
+        # NHWC为constexpr, 对应channels_last(通道步长1)或NCHW连续两种索引方式
+        pid_nc = tl.program_id(0)
+        pid_hw = tl.program_id(1)
+        n = pid_nc // C
+        c = pid_nc % C
+        offs = pid_hw * BLOCK + tl.arange(0, BLOCK)
+        mask = offs < OH * OW
+        oh = offs // OW
+        ow = offs % OW
+        acc = tl.zeros([BLOCK], dtype=tl.float32)
+        for kh in tl.static_range(KH):
+            for kw in tl.static_range(KW):
+                ih = oh + kh - PH
+                iw = ow + kw - PW
+                m = mask & (ih >= 0) & (ih < H) & (iw >= 0) & (iw < W)
+                if NHWC:
+                    x_off = ((n * H + ih) * W + iw) * C + c
+                else:
+                    x_off = pid_nc * H * W + ih * W + iw
+                xv = tl.load(x_ptr + x_off, mask=m, other=0.)
+                wv = tl.load(w_ptr + c * KH * KW + kh * KW + kw)
+                acc += xv.to(tl.float32) * wv.to(tl.float32)
+        if HAS_BIAS:
+            acc += tl.load(b_ptr + c).to(tl.float32)
+        if NHWC:
+            y_off = ((n * OH + oh) * OW + ow) * C + c
+        else:
+            y_off = pid_nc * OH * OW + offs
+        tl.store(y_ptr + y_off, acc, mask=mask)
+
+
+class TritonDWConv(nn.Module):
+    r"""
+    Depthwise conv specialized at eval time: the kernel extents are baked into
+    a Triton kernel as constexprs so the inner loops fully unroll. Wraps an
+    existing depthwise ``nn.Conv2d`` and reuses its weight/bias parameters
+    under the same attribute names, so state_dict keys are unchanged. Handles
+    both channels_last and NCHW-contiguous activations; falls back to
+    ``F.conv2d`` off-CUDA or for any other layout.
+    """
+    def __init__(self, conv):
+        super().__init__()
+        assert isinstance(conv, nn.Conv2d)
+        assert conv.groups == conv.in_channels == conv.out_channels
+        assert conv.stride == (1, 1) and conv.dilation == (1, 1)
+        self.weight = conv.weight
+        self.bias = conv.bias
+        self.kernel_size = conv.kernel_size
+        self.padding = conv.padding
+        self.groups = conv.groups
+
+    def forward(self, x):
+        # 模型整体运行在channels_last布局 (见ConvNeXt.forward), NCHW连续同样支持;
+        # Triton路径不接入autograd, 需要梯度时回退F.conv2d
+        nhwc = x.is_contiguous(memory_format=torch.channels_last)
+        if torch.is_grad_enabled() \
+                or not (has_triton and x.is_cuda and (nhwc or x.is_contiguous())):
+            return F.conv2d(x, self.weight, self.bias,
+                            padding=self.padding, groups=self.groups)
+        n, c, h, w = x.shape
+        kh, kw = self.kernel_size
+        ph, pw = self.padding
+        oh, ow = h + 2 * ph - kh + 1, w + 2 * pw - kw + 1
+        y = torch.empty(
+            (n, c, oh, ow), device=x.device, dtype=x.dtype,
+            memory_format=torch.channels_last if nhwc else torch.contiguous_format,
+        )
+        block = 128
+        grid = (n * c, triton.cdiv(oh * ow, block))
+        _dwconv2d_kernel[grid](
+            x, self.weight.contiguous(),
+            self.bias if self.bias is not None else self.weight,
+            y, c, h, w, oh, ow,
+            KH=kh, KW=kw, PH=ph, PW=pw, NHWC=nhwc,
+            HAS_BIAS=self.bias is not None, BLOCK=block,
+        )
+        return y
+
 
 class PartialConv2d(nn.Module):
     r""" 
@@ -37,51 +139,44 @@ class PartialConv2d(nn.Module):
                               groups=gps, bias=bias,
                               **kwargs,
                               )
-        self.split_indices = (in_channels - in_chs, in_chs)
+        self.identity_chs = in_channels - in_chs
 
     def forward(self, x):
-        identity, conv = torch.split(x, self.split_indices, dim=1)
-        return torch.cat(
-            (identity, self.conv(conv)),
-            dim=1,
-        )
+        # 恒等通道在前且连续: 只拷贝恒等切片, 卷积结果直接写入输出, 免去split/cat
+        out = torch.empty_like(x)
+        out[:, :self.identity_chs] = x[:, :self.identity_chs]
+        out[:, self.identity_chs:] = self.conv(x[:, self.identity_chs:])
+        return out
 
 
 class MSCABlock(nn.Module):
     r""" ConvNeXt Block with MSCA attention"""
-    def __init__(self, dim, kernel_sizes=[3, 11, 11],
+    def __init__(self, dim,
                 drop_path=0., layer_scale_init_value=1e-6,
                 conv_fn=nn.Conv2d,
                 ):
         super().__init__()
 
-        # 四分支配置 (3x3, 1x11, 11x1, identity)
-        self.conv_branches = nn.ModuleList([
-            conv_fn(dim//4, dim//4, kernel_size=(3,3), padding=1, groups=dim//4)
-            if i==0 else
-            conv_fn(dim//4, dim//4, kernel_size=(1,11), padding=(0,5), groups=dim//4)
-            if i==1 else
-            conv_fn(dim//4, dim//4, kernel_size=(11,1), padding=(5,0), groups=dim//4)
-            for i in range(3)
-        ])
-        self.identity = nn.Identity()
-
-        # 参数验证
-        assert len(kernel_sizes) == 3, "需要3个卷积核配置 [3x3, 1x11, 11x1]"
-        assert kernel_sizes[0] == 3 and kernel_sizes[1] == 11 and kernel_sizes[2] == 11, \
-            "卷积核尺寸需要为 [3, 11, 11]"
-
-        # 空间注意力机制
+        # 四分支配置 (3x3, 1x11, 11x1, identity): 前三路合并为一个11x11分组深度卷积
+        # (小核零填充到11x11后数学等价, 单次启动代替三次)
+        self.conv_channels = 3 * (dim // 4)
+        self.conv = conv_fn(self.conv_channels, self.conv_channels,
+                            kernel_size=11, padding=5, groups=self.conv_channels)
+
+        # 空间注意力机制 (NHWC下以Linear计算, 绕开cuDNN 1x1卷积的算法选择/启动开销;
+        # 首层作用在单通道均值图上, 退化为逐像素标量乘加, forward中直接广播计算)
+        self.attn_expand = nn.Linear(1, dim//8)
         self.attn = nn.Sequential(
-            nn.Conv2d(dim, dim//8, 1),
-            nn.LayerNorm([dim//8, 1, 1]),
+            nn.LayerNorm(dim//8),
             nn.GELU(),
-            nn.Conv2d(dim//8, dim, 1),
+            nn.Linear(dim//8, dim),
             nn.Sigmoid()
         )
 
-        # 通道融合卷积
-        self.channel_fusion = nn.Conv2d(dim*2, dim, 1)  # 包含原始输入和特征处理流
+        # 通道融合: 原2C->C的1x1卷积按W=[Wa|Wb]分解为两个C->C投影之和,
+        # 免去cat([identity, attended])这个2C宽中间张量的分配与写回
+        self.channel_fusion_a = nn.Linear(dim, dim)              # 作用于原始输入 (含bias)
+        self.channel_fusion_b = nn.Linear(dim, dim, bias=False)  # 作用于特征处理流
 
         self.norm = LayerNorm(dim, eps=1e-6)
         self.pwconv1 = nn.Linear(dim, 4 * dim)
@@ -91,54 +186,70 @@ class MSCABlock(nn.Module):
             if layer_scale_init_value > 0 else None
         self.drop_path = DropPath(drop_path) if drop_path > 0. else nn.Identity()
 
+        # 可选: 设CONVNEXT_FUSED_MLP=1时单独编译pwconv1->GELU->pwconv2尾段,
+        # Inductor分块计算使4*dim宽的中间激活不必整块写回显存
+        if os.environ.get('CONVNEXT_FUSED_MLP') and hasattr(torch, 'compile'):
+            self._mlp = torch.compile(self._mlp)
+
+    def _mlp(self, x):
+        return self.pwconv2(self.act(self.pwconv1(x)))
+
     def forward(self, x):
         identity = x
-        
-        # 分割输入到四个分支
-        x_split = torch.chunk(x, 4, dim=1)
-        
-        # 前三路卷积处理
-        conv_outs = [
-            branch(x_split[i]) for i, branch in enumerate(self.conv_branches)
-        ]
-        # 第四路恒等映射
-        conv_outs.append(self.identity(x_split[3]))
-        
-        # 拼接特征
-        fused = torch.cat(conv_outs, dim=1)
+
+        # 单次分组深度卷积处理前3/4通道, 其余通道恒等直通
+        fused = torch.cat(
+            (self.conv(x[:, :self.conv_channels]), x[:, self.conv_channels:]),
+            dim=1,
+        )
         
         # 第一次残差连接
         fused = identity + fused
-        
-        # 空间注意力
-        attn_map = self.attn(fused.mean(dim=1, keepdim=True))
+
+        # 此后注意力/融合/MLP全程在NHWC下以Linear计算, 进出各permute一次
+        # (channels_last内存布局下permute只改变视图)
+        fused = fused.permute(0, 2, 3, 1)
+
+        # 空间注意力 (通道均值一次归约, 首层以广播乘加展开到dim//8通道)
+        mean = fused.mean(dim=-1, keepdim=True)
+        expanded = torch.addcmul(self.attn_expand.bias, mean,
+                                 self.attn_expand.weight.view(1, 1, 1, -1))
+        attn_map = self.attn(expanded)
         attended = fused * attn_map
-        
-        # 通道融合
-        fused_features = torch.cat([identity, attended], dim=1)
-        fused_features = self.channel_fusion(fused_features)
-        
+
+        # 通道融合 (与channel_fusion(cat([identity, attended], dim=1))精确等价)
+        fused_features = self.channel_fusion_a(identity.permute(0, 2, 3, 1)) \
+            + self.channel_fusion_b(attended)
+
         # MLP处理
-        x = fused_features.permute(0, 2, 3, 1)
-        x = self.norm(x)
-        x = self.pwconv1(x)
-        x = self.act(x)
-        x = self.pwconv2(x)
-        
+        x = self.norm(fused_features)
+        x = self._mlp(x)
+
+        # 最终残差连接 (addcmul将LayerScale缩放融合进残差加法, 省一次整块读写)
+        x = self.drop_path(x.permute(0, 3, 1, 2))
+        fused_features = fused_features.permute(0, 3, 1, 2)
         if self.gamma is not None:
-            x = self.gamma * x
-        x = x.permute(0, 3, 1, 2)
-        
-        # 最终残差连接
-        return fused_features + self.drop_path(x)
+            return torch.addcmul(fused_features, x, self.gamma.view(1, -1, 1, 1))
+        return fused_features + x
+
+    @torch.no_grad()
+    def fuse_layer_scale(self):
+        # 推理期将LayerScale吸收进pwconv2的权重/偏置, 之后gamma不再参与计算
+        if self.gamma is None:
+            return
+        self.pwconv2.weight.mul_(self.gamma.view(-1, 1))
+        self.pwconv2.bias.mul_(self.gamma)
+        self.gamma = None
 
 
 class Block(nn.Module):
     r""" ConvNeXt Block. There are two equivalent implementations:
     (1) DwConv -> LayerNorm (channels_first) -> 1x1 Conv -> GELU -> 1x1 Conv; all in (N, C, H, W)
     (2) DwConv -> Permute to (N, H, W, C); LayerNorm (channels_last) -> Linear -> GELU -> Linear; Permute back
-    We use (2) as we find it slightly faster in PyTorch
-    
+    We use (1) with the block kept in channels_last memory format: activations already sit
+    NHWC in memory, so the two permutes of (2) become unnecessary and cuDNN dispatches its
+    NHWC kernels directly.
+
     Args:
         dim (int): Number of input channels.
         drop_path (float): Stochastic depth rate. Default: 0.0
@@ -150,28 +261,42 @@ class Block(nn.Module):
                 ):
         super().__init__()
         self.dwconv = conv_fn(dim, dim, kernel_size=kernel_size, padding=kernel_size//2, groups=dim) # depthwise conv
-        self.norm = LayerNorm(dim, eps=1e-6)
-        self.pwconv1 = nn.Linear(dim, 4 * dim) # pointwise/1x1 convs, implemented with linear layers
+        self.norm = LayerNorm(dim, eps=1e-6, data_format="channels_first")
+        self.pwconv1 = nn.Conv2d(dim, 4 * dim, kernel_size=1) # pointwise/1x1 convs, NHWC-native under channels_last
         self.act = nn.GELU()
-        self.pwconv2 = nn.Linear(4 * dim, dim)
-        self.gamma = nn.Parameter(layer_scale_init_value * torch.ones((dim)), 
+        self.pwconv2 = nn.Conv2d(4 * dim, dim, kernel_size=1)
+        self.gamma = nn.Parameter(layer_scale_init_value * torch.ones((dim)),
                                     requires_grad=True) if layer_scale_init_value > 0 else None
         self.drop_path = DropPath(drop_path) if drop_path > 0. else nn.Identity()
 
+        # 可选: 设CONVNEXT_FUSED_MLP=1时单独编译pwconv1->GELU->pwconv2尾段,
+        # Inductor分块计算使4*dim宽的中间激活不必整块写回显存
+        if os.environ.get('CONVNEXT_FUSED_MLP') and hasattr(torch, 'compile'):
+            self._mlp = torch.compile(self._mlp)
+
+    def _mlp(self, x):
+        return self.pwconv2(self.act(self.pwconv1(x)))
+
     def forward(self, x):
         input = x
         x = self.dwconv(x)
-        x = x.permute(0, 2, 3, 1) # (N, C, H, W) -> (N, H, W, C)
         x = self.norm(x)
-        x = self.pwconv1(x)
-        x = self.act(x)
-        x = self.pwconv2(x)
+        x = self._mlp(x)
+
+        # addcmul将LayerScale缩放融合进残差加法, 省一次整块读写
+        x = self.drop_path(x)
         if self.gamma is not None:
-            x = self.gamma * x
-        x = x.permute(0, 3, 1, 2) # (N, H, W, C) -> (N, C, H, W)
+            return torch.addcmul(input, x, self.gamma.view(1, -1, 1, 1))
+        return input + x
 
-        x = input + self.drop_path(x)
-        return x
+    @torch.no_grad()
+    def fuse_layer_scale(self):
+        # 推理期将LayerScale吸收进pwconv2的权重/偏置, 之后gamma不再参与计算
+        if self.gamma is None:
+            return
+        self.pwconv2.weight.mul_(self.gamma.view(-1, 1, 1, 1))
+        self.pwconv2.bias.mul_(self.gamma)
+        self.gamma = None
 
 
 class ConvNeXt(nn.Module):
@@ -224,7 +349,6 @@ class ConvNeXt(nn.Module):
         for i in range(self.num_stages):
             stage = nn.Sequential(
                 *[MSCABlock(dim=dims[i], drop_path=dp_rates[cur + j],
-                kernel_sizes=[3,5,7],
                 layer_scale_init_value=layer_scale_init_value,
                 conv_fn=conv_fns[i],
                 ) for j in range(depths[i])]
@@ -239,10 +363,41 @@ class ConvNeXt(nn.Module):
         self.head.weight.data.mul_(head_init_scale)
         self.head.bias.data.mul_(head_init_scale)
 
+        # NHWC权重布局, 与forward中的channels_last激活配套
+        self.to(memory_format=torch.channels_last)
+
+        # 可选: 设CONVNEXT_COMPILE=1时用TorchInductor整图编译forward
+        # (数据流固定无动态形状, Inductor可做Conv+GELU+LayerScale等算子融合)
+        if os.environ.get('CONVNEXT_COMPILE') and hasattr(torch, 'compile'):
+            torch.set_float32_matmul_precision('high')
+            self.forward = torch.compile(self.forward, mode='max-autotune', dynamic=False)
+
     def _init_weights(self, m):
         if isinstance(m, (nn.Conv2d, nn.Linear)):
             trunc_normal_(m.weight, std=.02)
-            nn.init.constant_(m.bias, 0)
+            if m.bias is not None:
+                nn.init.constant_(m.bias, 0)
+
+    @torch.no_grad()
+    def fuse_layer_scale(self):
+        """Fold LayerScale into pwconv2 across all blocks (inference only,
+        irreversible; requires layer_scale_init_value > 0)."""
+        for m in self.modules():
+            if isinstance(m, (Block, MSCABlock)):
+                m.fuse_layer_scale()
+
+    def specialize_depthwise(self):
+        """Swap every stride-1 depthwise Conv2d for a TritonDWConv specialized
+        on its kernel size (inference only, irreversible; call explicitly from
+        inference scripts, no-op when triton is unavailable)."""
+        if not has_triton:
+            return
+        for module in self.modules():
+            for name, child in module.named_children():
+                if isinstance(child, nn.Conv2d) \
+                        and child.groups == child.in_channels == child.out_channels \
+                        and child.stride == (1, 1) and child.dilation == (1, 1):
+                    setattr(module, name, TritonDWConv(child))
 
     def forward_features(self, x):
         for i in range(self.num_stages):
@@ -251,10 +406,19 @@ class ConvNeXt(nn.Module):
         return self.norm(x.mean([-2, -1])) # global average pooling, (N, C, H, W) -> (N, C)
 
     def forward(self, x):
+        x = x.contiguous(memory_format=torch.channels_last)
         x = self.forward_features(x)
         x = self.head(x)
         return x
 
+    @torch.inference_mode()
+    def forward_inference(self, x, dtype=torch.bfloat16):
+        """BF16 autocast inference entry: halves weight/activation bandwidth on
+        Ampere+/AMX-BF16 hardware; norm and sigmoid ops stay FP32 under the
+        autocast policy, and master weights remain FP32."""
+        with torch.autocast(device_type=x.device.type, dtype=dtype):
+            return self.forward(x)
+
 
 class LayerNorm(nn.Module):
     r""" LayerNorm that supports two data formats: channels_last (default) or channels_first. 
@@ -276,11 +440,45 @@ class LayerNorm(nn.Module):
         if self.data_format == "channels_last":
             return F.layer_norm(x, self.normalized_shape, self.weight, self.bias, self.eps)
         elif self.data_format == "channels_first":
-            u = x.mean(1, keepdim=True)
-            s = (x - u).pow(2).mean(1, keepdim=True)
-            x = (x - u) / torch.sqrt(s + self.eps)
-            x = self.weight[:, None, None] * x + self.bias[:, None, None]
-            return x
+            # 单个融合kernel代替手写的mean/var/normalize/affine多kernel序列
+            # (channels_last内存布局下permute只改变视图, 不搬运数据)
+            x = F.layer_norm(x.permute(0, 2, 3, 1), self.normalized_shape,
+                             self.weight, self.bias, self.eps)
+            return x.permute(0, 3, 1, 2)
+
+
+def quantize_convnext_int8(model, example_inputs, calibrate_fn=None, backend='fbgemm'):
+    """Post-training static INT8 quantization of the pointwise-conv GEMM path.
+
+    The 1x1 convs (pwconv1/pwconv2, channel fusion, attention projections) are
+    dense GEMMs that map onto x86 VNNI int8 dot-product kernels through FBGEMM.
+    LayerNorm and GELU stay FP32 per the standard recipe, and the depthwise
+    convs stay FP32 as well (low arithmetic intensity, little to gain).
+
+    Args:
+        model: a ConvNeXt instance (will be put in eval mode).
+        example_inputs: tuple of example tensors for FX tracing, e.g. (x,).
+        calibrate_fn: callable run on the prepared model to feed calibration
+            batches; skipping it leaves observers at their initial state.
+        backend: quantized engine, 'fbgemm' (x86) or 'qnnpack' (ARM).
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+    qconfig_mapping = get_default_qconfig_mapping(backend)
+    qconfig_mapping.set_object_type(nn.LayerNorm, None)
+    # 自定义LayerNorm不是FX叶子模块, trace后以F.layer_norm函数节点出现
+    qconfig_mapping.set_object_type(F.layer_norm, None)
+    qconfig_mapping.set_object_type(nn.GELU, None)
+    for name, m in model.named_modules():
+        if isinstance(m, nn.Conv2d) and m.groups > 1:
+            qconfig_mapping.set_module_name(name, None)
+
+    torch.backends.quantized.engine = backend
+    prepared = prepare_fx(model.eval(), qconfig_mapping, example_inputs)
+    if calibrate_fn is not None:
+        calibrate_fn(prepared)
+    return convert_fx(prepared)
 
 
 def _cfg(url='', **kwargs):
@@ -317,12 +515,62 @@ model_urls = {
 }
 
 
+def _prefetch_checkpoints(urls, max_workers=4):
+    """Concurrently pre-warm torch.hub's checkpoint cache.
+
+    Streams every URL into torch.hub's checkpoints directory (1 MiB chunks,
+    SHA256 computed inline and checked against the hash suffix torch.hub
+    embeds in the filename), so the following load_state_dict_from_url call
+    is a cache hit. Already-cached files are skipped; when `requests` is not
+    installed this is a no-op and torch.hub downloads as usual. Useful for
+    warming several checkpoints at once, e.g. for an ensemble.
+    """
+    try:
+        import requests
+    except ImportError:
+        return
+
+    ckpt_dir = os.path.join(torch.hub.get_dir(), 'checkpoints')
+    os.makedirs(ckpt_dir, exist_ok=True)
+
+    def fetch(url):
+        filename = os.path.basename(urlparse(url).path)
+        dest = os.path.join(ckpt_dir, filename)
+        if os.path.exists(dest):
+            return dest
+        match = re.search(r'-([a-f0-9]{8,})\.', filename)
+        sha256 = hashlib.sha256() if match else None
+        tmp = dest + '.part'
+        # best-effort: prefetch failure is not fatal, torch.hub re-downloads itself
+        try:
+            with requests.get(url, stream=True) as r:
+                r.raise_for_status()
+                with open(tmp, 'wb') as f:
+                    for chunk in r.iter_content(chunk_size=1 << 20):
+                        f.write(chunk)
+                        if sha256 is not None:
+                            sha256.update(chunk)
+            if sha256 is not None and not sha256.hexdigest().startswith(match.group(1)):
+                os.remove(tmp)
+                return None
+            os.replace(tmp, dest)
+            return dest
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        list(ex.map(fetch, urls))
+
+
 @register_model
 def convnext_tiny(pretrained=False,in_22k=False, **kwargs):
     model = ConvNeXt(depths=[3, 3, 9, 3], dims=[96, 192, 384, 768], **kwargs)
     model.default_cfg = _cfg()
     if pretrained:
         url = model_urls['convnext_tiny_22k'] if in_22k else model_urls['convnext_tiny_1k']
+        _prefetch_checkpoints([url])
         checkpoint = torch.hub.load_state_dict_from_url(url=url, map_location="cpu", check_hash=True)
         model.load_state_dict(checkpoint["model"])
     return model
@@ -336,6 +584,7 @@ def convnext_tiny_k5(pretrained=False,in_22k=False, **kwargs):
     model.default_cfg = _cfg()
     if pretrained:
         url = model_urls['convnext_tiny_k5_1k']
+        _prefetch_checkpoints([url])
         checkpoint = torch.hub.load_state_dict_from_url(url=url, map_location="cpu", check_hash=True)
         model.load_state_dict(checkpoint)
     return model
@@ -349,6 +598,7 @@ def convnext_tiny_k3(pretrained=False,in_22k=False, **kwargs):
     model.default_cfg = _cfg()
     if pretrained:
         url = model_urls['convnext_tiny_k3_1k']
+        _prefetch_checkpoints([url])
         checkpoint = torch.hub.load_state_dict_from_url(url=url, map_location="cpu", check_hash=True)
         model.load_state_dict(checkpoint)
     return model
@@ -363,6 +613,7 @@ def convnext_tiny_k3_par1_2(pretrained=False,in_22k=False, **kwargs):
     model.default_cfg = _cfg()
     if pretrained:
         url = model_urls['convnext_tiny_k3_par1_2_1k']
+        _prefetch_checkpoints([url])
         checkpoint = torch.hub.load_state_dict_from_url(url=url, map_location="cpu", check_hash=True)
         model.load_state_dict(checkpoint)
     return model
@@ -377,6 +628,7 @@ def convnext_tiny_k3_par3_8(pretrained=False,in_22k=False, **kwargs):
     model.default_cfg = _cfg()
     if pretrained:
         url = model_urls['convnext_tiny_k3_par3_8_1k']
+        _prefetch_checkpoints([url])
         checkpoint = torch.hub.load_state_dict_from_url(url=url, map_location="cpu", check_hash=True)
         model.load_state_dict(checkpoint)
     return model
@@ -391,6 +643,7 @@ def convnext_tiny_k3_par1_4(pretrained=False,in_22k=False, **kwargs):
     model.default_cfg = _cfg()
     if pretrained:
         url = model_urls['convnext_tiny_k3_par1_4_1k']
+        _prefetch_checkpoints([url])
         checkpoint = torch.hub.load_state_dict_from_url(url=url, map_location="cpu", check_hash=True)
         model.load_state_dict(checkpoint)
     return model
@@ -405,6 +658,7 @@ def convnext_tiny_k3_par1_8(pretrained=False,in_22k=False, **kwargs):
     model.default_cfg = _cfg()
     if pretrained:
         url = model_urls['convnext_tiny_k3_par1_8_1k']
+        _prefetch_checkpoints([url])
         checkpoint = torch.hub.load_state_dict_from_url(url=url, map_location="cpu", check_hash=True)
         model.load_state_dict(checkpoint)
     return model
@@ -419,6 +673,7 @@ def convnext_tiny_k3_par1_16(pretrained=False,in_22k=False, **kwargs):
     model.default_cfg = _cfg()
     if pretrained:
         url = model_urls['convnext_tiny_k3_par1_16_1k']
+        _prefetch_checkpoints([url])
         checkpoint = torch.hub.load_state_dict_from_url(url=url, map_location="cpu", check_hash=True)
         model.load_state_dict(checkpoint)
     return model
@@ -429,6 +684,7 @@ def convnext_small(pretrained=False,in_22k=False, **kwargs):
     model.default_cfg = _cfg()
     if pretrained:
         url = model_urls['convnext_small_22k'] if in_22k else model_urls['convnext_small_1k']
+        _prefetch_checkpoints([url])
         checkpoint = torch.hub.load_state_dict_from_url(url=url, map_location="cpu")
         model.load_state_dict(checkpoint["model"])
     return model
@@ -439,6 +695,7 @@ def convnext_base(pretrained=False, in_22k=False, **kwargs):
     model.default_cfg = _cfg()
     if pretrained:
         url = model_urls['convnext_base_22k'] if in_22k else model_urls['convnext_base_1k']
+        _prefetch_checkpoints([url])
         checkpoint = torch.hub.load_state_dict_from_url(url=url, map_location="cpu")
         model.load_state_dict(checkpoint["model"])
     return model
@@ -449,6 +706,7 @@ def convnext_large(pretrained=False, in_22k=False, **kwargs):
     model.default_cfg = _cfg()
     if pretrained:
         url = model_urls['convnext_large_22k'] if in_22k else model_urls['convnext_large_1k']
+        _prefetch_checkpoints([url])
         checkpoint = torch.hub.load_state_dict_from_url(url=url, map_location="cpu")
         model.load_state_dict(checkpoint["model"])
     return model
@@ -460,6 +718,7 @@ def convnext_xlarge(pretrained=False, in_22k=False, **kwargs):
     if pretrained:
         assert in_22k, "only ImageNet-22K pre-trained ConvNeXt-XL is available; please set in_22k=True"
         url = model_urls['convnext_xlarge_22k']
+        _prefetch_checkpoints([url])
         checkpoint = torch.hub.load_state_dict_from_url(url=url, map_location="cpu")
         model.load_state_dict(checkpoint["model"])
     return model
\ No newline at end of file